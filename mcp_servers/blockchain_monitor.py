@@ -7,18 +7,27 @@ Integration: Web3.py + Viem
 """
 
 import asyncio
-import json
-from typing import Dict, List, Optional
-from datetime import datetime
+import aiohttp
+import re
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from functools import lru_cache
 import sys
 
 try:
-    from web3 import Web3
-    from web3.middleware import geth_poa_middleware
+    from web3 import AsyncWeb3, AsyncHTTPProvider, Web3, WebsocketProviderV2
+    from web3.contract import AsyncContract
 except ImportError:
     print("Error: web3 package not found. Install with: pip install web3", file=sys.stderr)
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    print("Error: orjson package not found. Install with: pip install orjson", file=sys.stderr)
+    sys.exit(1)
+
 try:
     from mcp.server import Server
     from mcp.server.stdio import stdio_server
@@ -51,19 +60,244 @@ FIXIE_TOKEN_ABI = [
     }
 ]
 
+# Event signature hashes (topic0) derived from the ABI once at import.
+# to_hex keeps the 0x prefix regardless of the HexBytes version.
+EVENT_TOPICS = {
+    abi["name"]: Web3.to_hex(Web3.keccak(
+        text=f"{abi['name']}({','.join(param['type'] for param in abi['inputs'])})"
+    ))
+    for abi in FIXIE_TOKEN_ABI
+    if abi["type"] == "event"
+}
+TRANSFER_TOPIC = EVENT_TOPICS["Transfer"]
+
+# Max block span per eth_getLogs call, and full-size calls issued concurrently
+LOG_RANGE_SIZE = 2000
+LOG_FETCH_CONCURRENCY = 6
+
+# Events returned by monitor_events, and the first block window searched for them
+MAX_EVENTS = 50
+TAIL_WINDOW = 200
+
+# Blocks searched for an address's token transfers
+TRANSFER_LOOKBACK = 1000
+
+# EVM opcodes checked by check_vulnerabilities
+OP_PUSH1, OP_PUSH32 = 0x60, 0x7F
+OP_DELEGATECALL = 0xF4
+OP_SELFDESTRUCT = 0xFF
+
+@lru_cache(maxsize=256)
+def checksum_address(address: str) -> str:
+    """Memoized Web3.to_checksum_address (saves a keccak per repeated address)"""
+    return Web3.to_checksum_address(address)
+
+@lru_cache(maxsize=1024)
+def address_topic(address: str) -> str:
+    """Address as a 32-byte, zero-padded log topic"""
+    return "0x" + bytes.fromhex(address[2:]).rjust(32, b"\x00").hex()
+
+# Runs of bytes that are neither DELEGATECALL/SELFDESTRUCT nor a PUSH opcode, or a PUSHn
+# with its n immediate bytes. Matching it lets the C regex engine do the bytecode walk.
+_OPCODE_SKIP = re.compile(
+    rb"(?:[^\x60-\x7f\xf4\xff]+|"
+    + b"|".join(re.escape(bytes([op])) + b".{%d}" % (op - OP_PUSH1 + 1) for op in range(OP_PUSH1, OP_PUSH32 + 1))
+    + rb")*",
+    re.DOTALL
+)
+
+def scan_opcodes(code: bytes) -> Tuple[bool, bool]:
+    """Walk bytecode once, skipping PUSH data; returns (has_selfdestruct, has_delegatecall)"""
+    has_selfdestruct = has_delegatecall = False
+    i, n = 0, len(code)
+    while True:
+        i = _OPCODE_SKIP.match(code, i).end()
+        if i >= n:
+            break
+        op = code[i]
+        if op == OP_SELFDESTRUCT:
+            has_selfdestruct = True
+        elif op == OP_DELEGATECALL:
+            has_delegatecall = True
+        else:
+            break  # PUSH truncated by the end of the code
+        if has_selfdestruct and has_delegatecall:
+            break
+        i += 1
+    return has_selfdestruct, has_delegatecall
+
+def audit_bytecode(bytecode: bytes) -> Dict:
+    """Opcode and size checks on deployed bytecode"""
+    vulnerabilities = []
+    warnings = []
+    
+    has_selfdestruct, has_delegatecall = scan_opcodes(bytecode)
+    
+    # Selfdestruct opcode (0xff)
+    if has_selfdestruct:
+        vulnerabilities.append({
+            "severity": "HIGH",
+            "type": "SELFDESTRUCT",
+            "description": "Contract contains SELFDESTRUCT opcode - can be destroyed"
+        })
+    
+    # Delegatecall (0xf4)
+    if has_delegatecall:
+        warnings.append({
+            "severity": "MEDIUM",
+            "type": "DELEGATECALL",
+            "description": "Contract uses DELEGATECALL - ensure proper access control"
+        })
+    
+    # Contract size
+    bytecode_size = len(bytecode)
+    if bytecode_size > 24576:  # 24KB limit
+        warnings.append({
+            "severity": "LOW",
+            "type": "SIZE_LIMIT",
+            "description": f"Contract size ({bytecode_size} bytes) exceeds recommended limit"
+        })
+    
+    return {
+        "bytecode_size": bytecode_size,
+        "vulnerabilities": vulnerabilities,
+        "warnings": warnings
+    }
+
+RPC_URLS = {
+    "polygon-zkevm": "https://zkevm-rpc.com",
+    "scroll": "https://rpc.scroll.io",
+    "zksync": "https://mainnet.era.zksync.io"
+}
+
+# WebSocket endpoints for live log subscriptions (chains without one are polled)
+WS_URLS = {
+    "scroll": "wss://scroll-rpc.publicnode.com",
+    "zksync": "wss://mainnet.era.zksync.io/ws"
+}
+
+# Contract objects kept by BlockchainMonitor._contract
+CONTRACT_CACHE_SIZE = 256
+
+# Events kept per subscription buffer, and max concurrent subscriptions
+EVENT_BUFFER_SIZE = MAX_EVENTS
+MAX_SUBSCRIPTIONS = 32
+
+def format_event(event, timestamp: Optional[str]) -> Dict:
+    """Decoded event log -> JSON-ready dict"""
+    return {
+        "block_number": event["blockNumber"],
+        "transaction_hash": event["transactionHash"].hex(),
+        "log_index": event["logIndex"],
+        # uint256 values are stringified: they overflow JSON/orjson integers
+        "args": {
+            key: str(value) if isinstance(value, int) else value
+            for key, value in event["args"].items()
+        },
+        "timestamp": timestamp
+    }
+
 class BlockchainMonitor:
-    def __init__(self):
+    def __init__(self, batch_size: int = 25):
         self.providers = {
-            "polygon-zkevm": Web3(Web3.HTTPProvider("https://zkevm-rpc.com")),
-            "scroll": Web3(Web3.HTTPProvider("https://rpc.scroll.io")),
-            "zksync": Web3(Web3.HTTPProvider("https://mainnet.era.zksync.io"))
+            chain: AsyncWeb3(AsyncHTTPProvider(url, request_kwargs={"timeout": 30}))
+            for chain, url in RPC_URLS.items()
         }
         
-        # Add PoA middleware for compatibility
-        for provider in self.providers.values():
-            provider.middleware_onion.inject(geth_poa_middleware, layer=0)
+        # Max JSON-RPC calls per batch (public RPCs reject oversized batches)
+        self.batch_size = batch_size
+        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Live event buffers fed by WebSocket subscriptions, keyed by (chain, contract, event).
+        # Each holds the covered block range and a deque of the latest events.
+        self.event_buffers: Dict[tuple, Dict] = {}
+        self.subscriptions: Dict[tuple, asyncio.Task] = {}
+        
+        # Contract objects keyed by (chain, checksummed address), least recently used evicted
+        self._contracts: OrderedDict = OrderedDict()
+    
+    async def __aenter__(self):
+        # Single pooled session for the server lifetime (JSON-RPC batches)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={"User-Agent": "FixieRun-MCP/1.0"}
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        for task in list(self.subscriptions.values()):
+            task.cancel()
+        if self.session:
+            await self.session.close()
+            self.session = None
+    
+    def _http_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session, only available inside 'async with monitor'"""
+        if self.session is None:
+            raise RuntimeError("BlockchainMonitor HTTP session is not open: use 'async with monitor'")
+        return self.session
+    
+    def _contract(self, chain: str, contract_address: str) -> AsyncContract:
+        """Contract object for (chain, checksummed address), built once"""
+        key = (chain, contract_address)
+        if key in self._contracts:
+            self._contracts.move_to_end(key)
+            return self._contracts[key]
+        contract = self.providers[chain].eth.contract(address=contract_address, abi=FIXIE_TOKEN_ABI)
+        self._contracts[key] = contract
+        if len(self._contracts) > CONTRACT_CACHE_SIZE:
+            self._contracts.popitem(last=False)
+        return contract
+    
+    async def _rpc_batch(self, chain: str, calls: List[tuple]) -> List:
+        """Send (method, params) calls as JSON-RPC batches, results in call order"""
+        session = self._http_session()
+        
+        async def post_batch(start: int) -> List[Dict]:
+            payload = [
+                {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+                for i, (method, params) in enumerate(calls[start:start + self.batch_size], start)
+            ]
+            async with session.post(RPC_URLS[chain], json=payload) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"RPC batch failed: HTTP {response.status}")
+                data = await response.json(content_type=None)
+            if not isinstance(data, list):
+                # Providers without batch support answer with a single error object
+                raise RuntimeError(f"RPC batch rejected: {data.get('error', data)}")
+            return data
         
-        self.event_cache = []
+        chunks = await asyncio.gather(*[
+            post_batch(start) for start in range(0, len(calls), self.batch_size)
+        ])
+        
+        results = [None] * len(calls)
+        for chunk in chunks:
+            for item in chunk:
+                if "error" in item:
+                    raise RuntimeError(f"RPC error: {item['error']}")
+                results[item["id"]] = item.get("result")
+        return results
+    
+    async def _block_timestamps(self, chain: str, block_numbers: List[int]) -> Dict[int, str]:
+        """Block number -> ISO timestamp (UTC), fetched in one batched request"""
+        self._http_session()  # A missing session is a setup bug, not a failed lookup
+        numbers = sorted(set(block_numbers))
+        try:
+            blocks = await self._rpc_batch(
+                chain,
+                [("eth_getBlockByNumber", [hex(number), False]) for number in numbers]
+            )
+        except Exception as e:
+            # Timestamps are informational: events go out with timestamp None
+            print(f"Block timestamp lookup failed on {chain}: {e}", file=sys.stderr)
+            return {}
+        return {
+            number: datetime.fromtimestamp(int(block["timestamp"], 16), timezone.utc).isoformat()
+            for number, block in zip(numbers, blocks)
+            if block
+        }
     
     async def monitor_events(
         self, 
@@ -74,35 +308,69 @@ class BlockchainMonitor:
     ) -> Dict:
         """Monitor smart contract events"""
         try:
-            w3 = self.providers.get(chain)
-            if not w3:
+            # Validate input before any RPC (dead nodes surface through the call itself)
+            if chain not in self.providers:
                 return {"error": f"Unsupported chain: {chain}"}
             
-            if not w3.is_connected():
-                return {"error": f"Failed to connect to {chain}"}
+            if event_name not in EVENT_TOPICS:
+                return {"error": f"Unknown event: {event_name}"}
             
-            # Validate address
             if not Web3.is_address(contract_address):
                 return {"error": f"Invalid contract address: {contract_address}"}
             
-            contract_address = Web3.to_checksum_address(contract_address)
-            contract = w3.eth.contract(address=contract_address, abi=FIXIE_TOKEN_ABI)
+            w3 = self.providers[chain]
+            contract_address = checksum_address(contract_address)
+            contract = self._contract(chain, contract_address)
+            
+            # Resolve event topic
+            topic = EVENT_TOPICS[event_name]
+            event_abi = getattr(contract.events, event_name)()
+            
+            # Serve from the live subscription buffer when no explicit range is requested
+            key = (chain, contract_address, event_name)
+            buffer = self.event_buffers.get(key)
+            if from_block is None and buffer is not None:
+                return {
+                    "chain": chain,
+                    "contract": contract_address,
+                    "event_name": event_name,
+                    "source": "subscription",
+                    "from_block": buffer["from_block"],
+                    "to_block": buffer["to_block"],
+                    "events_count": len(buffer["events"]),
+                    "events": list(buffer["events"])
+                }
             
             # Get current block
-            current_block = w3.eth.block_number
+            current_block = await w3.eth.block_number
             from_block = from_block or (current_block - 1000)  # Last 1000 blocks
             
-            # Get event filter
-            event_filter = None
-            if event_name == "Transfer":
-                event_filter = contract.events.Transfer.create_filter(fromBlock=from_block)
-            elif event_name == "Staked":
-                event_filter = contract.events.Staked.create_filter(fromBlock=from_block)
-            else:
-                return {"error": f"Unknown event: {event_name}"}
-            
-            # Fetch events
-            events = event_filter.get_all_entries()
+            # Walk back from the head in growing windows until enough events are found,
+            # so busy contracts never materialize the whole range. Once windows reach
+            # LOG_RANGE_SIZE, several are fetched concurrently per step so wide, sparse
+            # ranges don't cost one sequential round-trip per chunk.
+            events = []
+            to_block, window = current_block, TAIL_WINDOW
+            while to_block >= from_block and len(events) < MAX_EVENTS:
+                ranges = []
+                for _ in range(LOG_FETCH_CONCURRENCY if window == LOG_RANGE_SIZE else 1):
+                    if to_block < from_block:
+                        break
+                    start = max(from_block, to_block - window + 1)
+                    ranges.append((start, to_block))
+                    to_block = start - 1
+                chunks = await asyncio.gather(*[
+                    w3.eth.get_logs({
+                        "address": contract_address,
+                        "topics": [topic],
+                        "fromBlock": start,
+                        "toBlock": end
+                    })
+                    for start, end in ranges
+                ])
+                # Ranges run newest-first; keep events in block order
+                events = [log for chunk in reversed(chunks) for log in chunk] + events
+                window = min(window * 4, LOG_RANGE_SIZE)
             
             result = {
                 "chain": chain,
@@ -110,135 +378,276 @@ class BlockchainMonitor:
                 "event_name": event_name,
                 "from_block": from_block,
                 "to_block": current_block,
-                "events_count": len(events),
+                "scanned_from_block": to_block + 1,
+                "events_count": len(events),  # Events in [scanned_from_block, to_block]
                 "events": []
             }
             
-            for event in events[-50:]:  # Limit to last 50 events
-                result["events"].append({
-                    "block_number": event["blockNumber"],
-                    "transaction_hash": event["transactionHash"].hex(),
-                    "args": dict(event["args"]),
-                    "timestamp": datetime.now().isoformat()
-                })
+            # Keep the most recent events: decode only those, and resolve their block times in one batch
+            recent = [event_abi.process_log(log) for log in events[-MAX_EVENTS:]]
+            block_times = await self._block_timestamps(chain, [event["blockNumber"] for event in recent])
+            result["events"] = [
+                format_event(event, block_times.get(event["blockNumber"])) for event in recent
+            ]
+            
+            # Keep this contract's events live for subsequent calls
+            if (
+                chain in WS_URLS
+                and key not in self.subscriptions
+                and len(self.subscriptions) < MAX_SUBSCRIPTIONS
+            ):
+                self.subscriptions[key] = asyncio.create_task(
+                    self._run_subscription(
+                        key, topic, event_abi, result["events"], from_block, current_block
+                    )
+                )
             
             return result
             
         except Exception as e:
             return {"error": str(e), "chain": chain}
     
+    async def _run_subscription(
+        self,
+        key: tuple,
+        topic: str,
+        event_abi,
+        seed: List[Dict],
+        from_block: int,
+        seed_to_block: int
+    ):
+        """Stream logs over eth_subscribe into the event buffer for key"""
+        chain, contract_address, _ = key
+        try:
+            async with AsyncWeb3.persistent_websocket(WebsocketProviderV2(WS_URLS[chain])) as w3:
+                log_filter = {"address": contract_address, "topics": [topic]}
+                await w3.eth.subscribe("logs", log_filter)
+                
+                # Close the gap between the seed scan and the subscription before serving:
+                # anything mined since seed_to_block is fetched once, then deduplicated
+                # against the stream
+                head = await w3.eth.block_number
+                backfill = []
+                if head > seed_to_block:
+                    backfill = await w3.eth.get_logs({
+                        **log_filter, "fromBlock": seed_to_block + 1, "toBlock": head
+                    })
+                backfilled = {(log["blockNumber"], log["logIndex"]) for log in backfill}
+                block_times = await self._block_timestamps(chain, [log["blockNumber"] for log in backfill])
+                
+                events = deque(seed, maxlen=EVENT_BUFFER_SIZE)
+                events.extend(
+                    format_event(event_abi.process_log(log), block_times.get(log["blockNumber"]))
+                    for log in backfill
+                )
+                buffer = {"from_block": from_block, "to_block": max(head, seed_to_block), "events": events}
+                self.event_buffers[key] = buffer
+                
+                # Logs arrive in block order: one timestamp lookup per new block
+                last_block, last_time = None, None
+                async for payload in w3.ws.process_subscriptions():
+                    log = payload["result"]
+                    if log.get("removed"):
+                        # Reorged out: drop the copy delivered earlier
+                        removed = (log["transactionHash"].hex(), log["logIndex"])
+                        for entry in [e for e in events if (e["transaction_hash"], e["log_index"]) == removed]:
+                            events.remove(entry)
+                        backfilled.discard((log["blockNumber"], log["logIndex"]))
+                        continue
+                    if (log["blockNumber"], log["logIndex"]) in backfilled:
+                        continue
+                    if log["blockNumber"] != last_block:
+                        last_block = log["blockNumber"]
+                        last_time = (await self._block_timestamps(chain, [last_block])).get(last_block)
+                    events.append(format_event(event_abi.process_log(log), last_time))
+                    buffer["to_block"] = max(buffer["to_block"], last_block)
+        except Exception as e:
+            print(f"Subscription {key} stopped: {e}", file=sys.stderr)
+        finally:
+            # Stale buffers must not be served: fall back to eth_getLogs
+            self.event_buffers.pop(key, None)
+            self.subscriptions.pop(key, None)
+    
     async def check_vulnerabilities(self, contract_address: str, chain: str = "polygon-zkevm") -> Dict:
         """Basic smart contract security checks"""
         try:
-            w3 = self.providers.get(chain)
-            if not w3 or not w3.is_connected():
-                return {"error": f"Connection failed to {chain}"}
+            if chain not in self.providers:
+                return {"error": f"Unsupported chain: {chain}"}
             
-            contract_address = Web3.to_checksum_address(contract_address)
+            if not Web3.is_address(contract_address):
+                return {"error": f"Invalid contract address: {contract_address}"}
             
-            # Get contract bytecode
-            bytecode = w3.eth.get_code(contract_address).hex()
+            w3 = self.providers[chain]
+            contract_address = checksum_address(contract_address)
             
-            vulnerabilities = []
-            warnings = []
+            # Get contract bytecode
+            bytecode = bytes(await w3.eth.get_code(contract_address))
             
-            # Check 1: Contract exists
-            if bytecode == "0x":
+            # Contract exists
+            if not bytecode:
                 return {"error": "No contract found at this address"}
             
-            # Check 2: Selfdestruct opcode (0xff)
-            if "ff" in bytecode:
-                vulnerabilities.append({
-                    "severity": "HIGH",
-                    "type": "SELFDESTRUCT",
-                    "description": "Contract contains SELFDESTRUCT opcode - can be destroyed"
-                })
-            
-            # Check 3: Delegatecall (0xf4)
-            if "f4" in bytecode:
-                warnings.append({
-                    "severity": "MEDIUM",
-                    "type": "DELEGATECALL",
-                    "description": "Contract uses DELEGATECALL - ensure proper access control"
-                })
-            
-            # Check 4: Contract size
-            bytecode_size = len(bytecode) // 2  # Convert hex to bytes
-            if bytecode_size > 24576:  # 24KB limit
-                warnings.append({
-                    "severity": "LOW",
-                    "type": "SIZE_LIMIT",
-                    "description": f"Contract size ({bytecode_size} bytes) exceeds recommended limit"
-                })
-            
             return {
                 "chain": chain,
                 "contract": contract_address,
-                "bytecode_size": bytecode_size,
-                "vulnerabilities": vulnerabilities,
-                "warnings": warnings,
-                "scan_timestamp": datetime.now().isoformat(),
+                **audit_bytecode(bytecode),
+                "scan_timestamp": datetime.now(timezone.utc).isoformat(),
+                "recommendation": "Run full audit with Slither or Mythril for production contracts"
+            }
+            
+        except Exception as e:
+            return {"error": str(e)}
+    
+    async def check_vulnerabilities_batch(
+        self,
+        contract_addresses: List[str],
+        chain: str = "polygon-zkevm"
+    ) -> Dict:
+        """Security checks on many contracts, fetching all bytecode in batched eth_getCode calls"""
+        try:
+            if chain not in self.providers:
+                return {"error": f"Unsupported chain: {chain}"}
+            
+            invalid = [address for address in contract_addresses if not Web3.is_address(address)]
+            if invalid:
+                return {"error": f"Invalid contract addresses: {invalid}"}
+            
+            addresses = [checksum_address(address) for address in contract_addresses]
+            codes = await self._rpc_batch(
+                chain,
+                [("eth_getCode", [address, "latest"]) for address in addresses]
+            )
+            
+            reports = []
+            for address, code in zip(addresses, codes):
+                bytecode = bytes.fromhex((code or "0x")[2:])
+                if not bytecode:
+                    reports.append({"contract": address, "error": "No contract found at this address"})
+                else:
+                    reports.append({"contract": address, **audit_bytecode(bytecode)})
+            
+            return {
+                "chain": chain,
+                "contracts": reports,
+                "scan_timestamp": datetime.now(timezone.utc).isoformat(),
                 "recommendation": "Run full audit with Slither or Mythril for production contracts"
             }
             
         except Exception as e:
             return {"error": str(e)}
     
+    async def _native_transactions(
+        self,
+        w3: AsyncWeb3,
+        chain: str,
+        address: str,
+        current_block: int,
+        tx_count: int
+    ) -> List[Dict]:
+        """Scan the last 100 blocks for native transfers from/to address"""
+        # Fetch the blocks in batched eth_getBlockByNumber calls
+        block_numbers = list(range(current_block, max(current_block - 100, 0), -1))
+        blocks = await self._rpc_batch(
+            chain,
+            [("eth_getBlockByNumber", [hex(block_num), True]) for block_num in block_numbers]
+        )
+        
+        # Nodes return addresses lowercase or checksummed: matching both spellings
+        # with a set lookup avoids normalizing every tx's from/to
+        address_forms = frozenset((address, address.lower()))
+        transactions = []
+        for block_num, block in zip(block_numbers, blocks):
+            if not block:
+                continue
+            for tx in block["transactions"]:
+                sender, recipient = tx["from"], tx.get("to")
+                if sender in address_forms or recipient in address_forms:
+                    transactions.append({
+                        "hash": tx["hash"],
+                        "from": Web3.to_checksum_address(sender),
+                        "to": Web3.to_checksum_address(recipient) if recipient else None,
+                        "value": str(w3.from_wei(int(tx["value"], 16), 'ether')),
+                        "block": block_num,
+                        "gas_price": str(w3.from_wei(int(tx.get("gasPrice", "0x0"), 16), 'gwei')),
+                        "type": "sent" if sender in address_forms else "received"
+                    })
+                    
+                    if len(transactions) >= tx_count:
+                        return transactions
+        
+        return transactions
+    
     async def track_transactions(
         self, 
         address: str, 
         chain: str = "polygon-zkevm",
-        tx_count: int = 10
+        tx_count: int = 10,
+        include_native: bool = False
     ) -> Dict:
-        """Track recent transactions for an address"""
+        """Track recent token transfers (and optionally native transactions) for an address"""
         try:
-            w3 = self.providers.get(chain)
-            if not w3 or not w3.is_connected():
-                return {"error": f"Connection failed to {chain}"}
+            if chain not in self.providers:
+                return {"error": f"Unsupported chain: {chain}"}
             
-            address = Web3.to_checksum_address(address)
+            if not Web3.is_address(address):
+                return {"error": f"Invalid address: {address}"}
             
-            # Get transaction count
-            nonce = w3.eth.get_transaction_count(address)
+            w3 = self.providers[chain]
+            address = checksum_address(address)
             
-            # Get balance
-            balance_wei = w3.eth.get_balance(address)
+            # Transaction count, balance and current block in parallel
+            nonce, balance_wei, current_block = await asyncio.gather(
+                w3.eth.get_transaction_count(address),
+                w3.eth.get_balance(address),
+                w3.eth.block_number
+            )
             balance_eth = w3.from_wei(balance_wei, 'ether')
             
-            # Get current block for recent transactions scan
-            current_block = w3.eth.block_number
-            
-            transactions = []
-            # Scan last 100 blocks for transactions
-            for block_num in range(current_block, max(current_block - 100, 0), -1):
-                block = w3.eth.get_block(block_num, full_transactions=True)
-                for tx in block.transactions:
-                    if tx['from'] == address or tx['to'] == address:
-                        transactions.append({
-                            "hash": tx['hash'].hex(),
-                            "from": tx['from'],
-                            "to": tx['to'],
-                            "value": str(w3.from_wei(tx['value'], 'ether')),
-                            "block": block_num,
-                            "gas_price": str(w3.from_wei(tx.get('gasPrice', 0), 'gwei')),
-                            "type": "sent" if tx['from'] == address else "received"
-                        })
-                        
-                        if len(transactions) >= tx_count:
-                            break
-                
-                if len(transactions) >= tx_count:
-                    break
+            # Transfer logs with the address as sender (topic1) or recipient (topic2):
+            # the node filters, so no block bodies are downloaded
+            topic = address_topic(address)
+            log_filter = {
+                "fromBlock": max(current_block - TRANSFER_LOOKBACK, 0),
+                "toBlock": current_block
+            }
+            sent, received = await asyncio.gather(
+                w3.eth.get_logs({**log_filter, "topics": [TRANSFER_TOPIC, topic]}),
+                w3.eth.get_logs({**log_filter, "topics": [TRANSFER_TOPIC, None, topic]})
+            )
             
-            return {
+            transfers = {}
+            for direction, logs in (("sent", sent), ("received", received)):
+                for log in logs:
+                    if len(log["topics"]) != 3:  # ERC-721 Transfer indexes tokenId
+                        continue
+                    transfers.setdefault((log["blockNumber"], log["logIndex"]), {
+                        "hash": log["transactionHash"].hex(),
+                        "token": log["address"],
+                        "from": checksum_address("0x" + log["topics"][1].hex()[-40:]),
+                        "to": checksum_address("0x" + log["topics"][2].hex()[-40:]),
+                        "value": str(int.from_bytes(log["data"], "big")),  # Raw token units
+                        "block": log["blockNumber"],
+                        "type": direction
+                    })
+            token_transfers = [transfers[k] for k in sorted(transfers, reverse=True)[:tx_count]]
+            
+            result = {
                 "chain": chain,
                 "address": address,
                 "balance_eth": str(balance_eth),
                 "transaction_count": nonce,
-                "recent_transactions": transactions[:tx_count],
-                "timestamp": datetime.now().isoformat()
+                "token_transfers": token_transfers,
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
+            # Native transfers are not logged: they still need a block scan
+            if include_native:
+                result["recent_transactions"] = await self._native_transactions(
+                    w3, chain, address, current_block, tx_count
+                )
+            
+            return result
+            
         except Exception as e:
             return {"error": str(e)}
 
@@ -246,6 +655,22 @@ class BlockchainMonitor:
 app = Server("blockchain-monitor")
 monitor = BlockchainMonitor()
 
+# Shared tool argument: compact JSON (default) or indented output
+COMPACT_PROPERTY = {
+    "type": "boolean",
+    "default": True,
+    "description": "Return compact JSON (set false for indented output)"
+}
+
+def text_content(result, compact: bool = True) -> List[TextContent]:
+    """Serialize a tool result with orjson; bytes-like values (HexBytes) become hex"""
+    text = orjson.dumps(
+        result,
+        default=lambda value: value.hex() if hasattr(value, "hex") else str(value),
+        option=None if compact else orjson.OPT_INDENT_2
+    )
+    return [TextContent(type="text", text=text.decode())]
+
 @app.list_tools()
 async def list_tools() -> List[Tool]:
     return [
@@ -266,13 +691,14 @@ async def list_tools() -> List[Tool]:
                     },
                     "event_name": {
                         "type": "string",
-                        "enum": ["Transfer", "Staked"],
+                        "enum": list(EVENT_TOPICS),
                         "default": "Transfer"
                     },
                     "from_block": {
                         "type": "integer",
                         "description": "Starting block number (default: current - 1000)"
-                    }
+                    },
+                    "compact": COMPACT_PROPERTY
                 },
                 "required": ["contract_address"]
             }
@@ -291,14 +717,36 @@ async def list_tools() -> List[Tool]:
                         "type": "string",
                         "enum": ["polygon-zkevm", "scroll", "zksync"],
                         "default": "polygon-zkevm"
-                    }
+                    },
+                    "compact": COMPACT_PROPERTY
                 },
                 "required": ["contract_address"]
             }
         ),
+        Tool(
+            name="check_vulnerabilities_batch",
+            description="Run the check_vulnerabilities bytecode checks on several contracts at once. Bytecode is fetched in batched RPC calls.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "contract_addresses": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Smart contract addresses to audit"
+                    },
+                    "chain": {
+                        "type": "string",
+                        "enum": ["polygon-zkevm", "scroll", "zksync"],
+                        "default": "polygon-zkevm"
+                    },
+                    "compact": COMPACT_PROPERTY
+                },
+                "required": ["contract_addresses"]
+            }
+        ),
         Tool(
             name="track_transactions",
-            description="Track recent transactions for a wallet address. Returns balance and transaction history.",
+            description="Track recent activity for a wallet address. Returns balance, token transfers and optionally native transactions.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -315,7 +763,13 @@ async def list_tools() -> List[Tool]:
                         "type": "integer",
                         "default": 10,
                         "description": "Number of recent transactions to fetch"
-                    }
+                    },
+                    "include_native": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Also scan the last 100 blocks for native transfers (slower)"
+                    },
+                    "compact": COMPACT_PROPERTY
                 },
                 "required": ["address"]
             }
@@ -324,6 +778,8 @@ async def list_tools() -> List[Tool]:
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Dict) -> List[TextContent]:
+    compact = arguments.get("compact", True)
+    
     if name == "monitor_events":
         result = await monitor.monitor_events(
             contract_address=arguments["contract_address"],
@@ -331,25 +787,46 @@ async def call_tool(name: str, arguments: Dict) -> List[TextContent]:
             event_name=arguments.get("event_name", "Transfer"),
             from_block=arguments.get("from_block")
         )
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return text_content(result, compact)
     
     elif name == "check_vulnerabilities":
         result = await monitor.check_vulnerabilities(
             contract_address=arguments["contract_address"],
             chain=arguments.get("chain", "polygon-zkevm")
         )
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return text_content(result, compact)
+    
+    elif name == "check_vulnerabilities_batch":
+        result = await monitor.check_vulnerabilities_batch(
+            contract_addresses=arguments["contract_addresses"],
+            chain=arguments.get("chain", "polygon-zkevm")
+        )
+        return text_content(result, compact)
     
     elif name == "track_transactions":
         result = await monitor.track_transactions(
             address=arguments["address"],
             chain=arguments.get("chain", "polygon-zkevm"),
-            tx_count=arguments.get("tx_count", 10)
+            tx_count=arguments.get("tx_count", 10),
+            include_native=arguments.get("include_native", False)
         )
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+        return text_content(result, compact)
     
     else:
-        return [TextContent(type="text", text=json.dumps({"error": f"Unknown tool: {name}"}))]
+        return text_content({"error": f"Unknown tool: {name}"})
+
+async def main():
+    # Open the shared HTTP session once, close it on shutdown
+    async with monitor:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(read_stream, write_stream, app.create_initialization_options())
 
 if __name__ == "__main__":
-    asyncio.run(stdio_server(app))
+    # Use libuv's event loop when available (optional speedup)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    asyncio.run(main())
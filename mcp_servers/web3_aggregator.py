@@ -8,10 +8,28 @@ Transport: stdio
 import asyncio
 import aiohttp
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional
 import sys
 
+try:
+    import orjson
+except ImportError:
+    print("Error: orjson package not found. Install with: pip install orjson", file=sys.stderr)
+    sys.exit(1)
+
+try:
+    from eth_abi import decode, encode
+except ImportError:
+    print("Error: eth-abi package not found. Install with: pip install eth-abi", file=sys.stderr)
+    sys.exit(1)
+
+try:
+    from cachetools import TTLCache
+except ImportError:
+    print("Error: cachetools package not found. Install with: pip install cachetools", file=sys.stderr)
+    sys.exit(1)
+
 # FastMCP pour Model Context Protocol
 try:
     from mcp.server import Server
@@ -25,14 +43,30 @@ except ImportError:
 DEFILLAMA_BASE_URL = "https://api.llama.fi"
 COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
 ZKEVM_RPC_URL = "https://zkevm-rpc.com"
+RPC_URLS = {
+    "polygon-zkevm": "https://zkevm-rpc.com",
+    "scroll": "https://rpc.scroll.io",
+    "zksync": "https://mainnet.era.zksync.io"
+}
+
+# Multicall3 deployments (zkSync Era derives CREATE2 addresses differently)
+MULTICALL3_ADDRESSES = {
+    "polygon-zkevm": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "scroll": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    "zksync": "0xF9cda624FBC7e059355ce98a31693d299FACd963"
+}
+AGGREGATE3_SELECTOR = "0x82ad56cb"  # aggregate3((address,bool,bytes)[])
 
 class Web3Aggregator:
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
-        self.cache: Dict = {}
+        self.tvl_cache = TTLCache(maxsize=512, ttl=3600)  # 1h cache
+        self.price_cache = TTLCache(maxsize=1024, ttl=300)  # 5min cache
         
     async def __aenter__(self):
+        # Single pooled session for the server lifetime: keeps TCP/TLS connections alive
         self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300),
             timeout=aiohttp.ClientTimeout(total=30),
             headers={"User-Agent": "FixieRun-MCP/1.0"}
         )
@@ -45,11 +79,8 @@ class Web3Aggregator:
     async def fetch_tvl(self, protocol: str = "all") -> Dict:
         """Fetch Total Value Locked from DeFiLlama"""
         try:
-            cache_key = f"tvl_{protocol}"
-            if cache_key in self.cache:
-                cached_time, data = self.cache[cache_key]
-                if (datetime.now() - cached_time).seconds < 3600:  # 1h cache
-                    return data
+            if (cached := self.tvl_cache.get(protocol)) is not None:
+                return cached
             
             if protocol == "all":
                 url = f"{DEFILLAMA_BASE_URL}/tvl"
@@ -59,7 +90,7 @@ class Web3Aggregator:
             async with self.session.get(url) as response:
                 if response.status == 200:
                     data = await response.json()
-                    self.cache[cache_key] = (datetime.now(), data)
+                    self.tvl_cache[protocol] = data
                     return data
                 else:
                     return {"error": f"HTTP {response.status}", "protocol": protocol}
@@ -91,13 +122,7 @@ class Web3Aggregator:
     async def query_blockchain(self, chain: str = "polygon-zkevm", method: str = "eth_blockNumber") -> Dict:
         """Query blockchain RPC endpoints"""
         try:
-            rpc_urls = {
-                "polygon-zkevm": "https://zkevm-rpc.com",
-                "scroll": "https://rpc.scroll.io",
-                "zksync": "https://mainnet.era.zksync.io"
-            }
-            
-            rpc_url = rpc_urls.get(chain, ZKEVM_RPC_URL)
+            rpc_url = RPC_URLS.get(chain, ZKEVM_RPC_URL)
             
             payload = {
                 "jsonrpc": "2.0",
@@ -120,14 +145,57 @@ class Web3Aggregator:
         except Exception as e:
             return {"error": str(e), "chain": chain}
     
+    async def multicall(self, chain: str, calls: List[Dict]) -> Dict:
+        """Run many eth_calls in a single RPC round-trip through Multicall3.aggregate3"""
+        try:
+            if chain not in MULTICALL3_ADDRESSES:
+                return {"error": f"Unsupported chain: {chain}"}
+            
+            rpc_url = RPC_URLS[chain]
+            
+            calldata = AGGREGATE3_SELECTOR + encode(
+                ["(address,bool,bytes)[]"],
+                [[
+                    (call["target"], call.get("allowFailure", True), bytes.fromhex(call["callData"].removeprefix("0x")))
+                    for call in calls
+                ]]
+            ).hex()
+            
+            payload = {
+                "jsonrpc": "2.0",
+                "method": "eth_call",
+                "params": [{"to": MULTICALL3_ADDRESSES[chain], "data": calldata}, "latest"],
+                "id": 1
+            }
+            
+            async with self.session.post(rpc_url, json=payload) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if "error" in data:
+                        return {"error": data["error"], "chain": chain}
+                    if data.get("result") in (None, "0x"):
+                        return {
+                            "error": f"No Multicall3 contract at {MULTICALL3_ADDRESSES[chain]}",
+                            "chain": chain
+                        }
+                    (results,) = decode(["(bool,bytes)[]"], bytes.fromhex(data["result"][2:]))
+                    return {
+                        "chain": chain,
+                        "results": [
+                            {"success": success, "returnData": "0x" + return_data.hex()}
+                            for success, return_data in results
+                        ]
+                    }
+                else:
+                    return {"error": f"RPC call failed: {response.status}"}
+        except Exception as e:
+            return {"error": str(e), "chain": chain}
+    
     async def get_token_price(self, token_id: str = "ethereum") -> Dict:
         """Get token price from CoinGecko"""
         try:
-            cache_key = f"price_{token_id}"
-            if cache_key in self.cache:
-                cached_time, data = self.cache[cache_key]
-                if (datetime.now() - cached_time).seconds < 300:  # 5min cache
-                    return data
+            if (cached := self.price_cache.get(token_id)) is not None:
+                return cached
             
             url = f"{COINGECKO_BASE_URL}/simple/price"
             params = {
@@ -145,19 +213,53 @@ class Web3Aggregator:
                         "price_usd": data.get(token_id, {}).get("usd"),
                         "change_24h": data.get(token_id, {}).get("usd_24h_change"),
                         "market_cap": data.get(token_id, {}).get("usd_market_cap"),
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": datetime.now(timezone.utc).isoformat()
                     }
-                    self.cache[cache_key] = (datetime.now(), result)
+                    self.price_cache[token_id] = result
                     return result
                 else:
                     return {"error": f"CoinGecko API error: {response.status}"}
         except Exception as e:
             return {"error": str(e)}
+    
+    async def get_dashboard(
+        self,
+        protocol: str = "all",
+        token_id: str = "ethereum",
+        chain: str = "polygon-zkevm"
+    ) -> Dict:
+        """Fetch TVL, token price and block number concurrently"""
+        tvl, price, block = await asyncio.gather(
+            self.fetch_tvl(protocol),
+            self.get_token_price(token_id),
+            self.query_blockchain(chain),
+            return_exceptions=True
+        )
+        return {
+            name: {"error": str(value)} if isinstance(value, BaseException) else value
+            for name, value in (("tvl", tvl), ("price", price), ("block", block))
+        }
 
 # MCP Server Setup
 app = Server("web3-aggregator")
 aggregator = Web3Aggregator()
 
+# Shared tool argument: compact JSON (default) or indented output
+COMPACT_PROPERTY = {
+    "type": "boolean",
+    "default": True,
+    "description": "Return compact JSON (set false for indented output)"
+}
+
+def text_content(result, compact: bool = True) -> List[TextContent]:
+    """Serialize a tool result with orjson"""
+    try:
+        text = orjson.dumps(result, default=str, option=None if compact else orjson.OPT_INDENT_2).decode()
+    except orjson.JSONEncodeError:
+        # Upstream payloads may carry integers wider than 64 bits, which only json handles
+        text = json.dumps(result, default=str, indent=None if compact else 2)
+    return [TextContent(type="text", text=text)]
+
 @app.list_tools()
 async def list_tools() -> List[Tool]:
     return [
@@ -171,7 +273,8 @@ async def list_tools() -> List[Tool]:
                         "type": "string",
                         "description": "Protocol name (e.g., 'aave', 'uniswap') or 'all' for global TVL",
                         "default": "all"
-                    }
+                    },
+                    "compact": COMPACT_PROPERTY
                 }
             }
         ),
@@ -184,7 +287,8 @@ async def list_tools() -> List[Tool]:
                     "protocol_name": {
                         "type": "string",
                         "description": "Protocol slug (e.g., 'aave', 'curve', 'uniswap')"
-                    }
+                    },
+                    "compact": COMPACT_PROPERTY
                 },
                 "required": ["protocol_name"]
             }
@@ -205,10 +309,49 @@ async def list_tools() -> List[Tool]:
                         "type": "string",
                         "description": "RPC method (e.g., 'eth_blockNumber', 'eth_gasPrice')",
                         "default": "eth_blockNumber"
-                    }
+                    },
+                    "compact": COMPACT_PROPERTY
                 }
             }
         ),
+        Tool(
+            name="multicall",
+            description="Batch several read-only contract calls (eth_call) into one RPC request via Multicall3. Returns success flag and raw return data per call.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "chain": {
+                        "type": "string",
+                        "enum": ["polygon-zkevm", "scroll", "zksync"],
+                        "default": "polygon-zkevm"
+                    },
+                    "calls": {
+                        "type": "array",
+                        "description": "Calls to aggregate",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "target": {
+                                    "type": "string",
+                                    "description": "Contract address"
+                                },
+                                "callData": {
+                                    "type": "string",
+                                    "description": "ABI-encoded call data (0x...)"
+                                },
+                                "allowFailure": {
+                                    "type": "boolean",
+                                    "default": True
+                                }
+                            },
+                            "required": ["target", "callData"]
+                        }
+                    },
+                    "compact": COMPACT_PROPERTY
+                },
+                "required": ["calls"]
+            }
+        ),
         Tool(
             name="get_token_price",
             description="Get current token price and 24h change from CoinGecko. Returns USD price, market cap, and price change.",
@@ -219,7 +362,33 @@ async def list_tools() -> List[Tool]:
                         "type": "string",
                         "description": "CoinGecko token ID (e.g., 'ethereum', 'bitcoin', 'polygon-zkevm')",
                         "default": "ethereum"
-                    }
+                    },
+                    "compact": COMPACT_PROPERTY
+                }
+            }
+        ),
+        Tool(
+            name="get_dashboard",
+            description="Fetch TVL (DeFiLlama), token price (CoinGecko) and latest block number in one call. All three sources are queried concurrently.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "protocol": {
+                        "type": "string",
+                        "description": "Protocol name or 'all' for global TVL",
+                        "default": "all"
+                    },
+                    "token_id": {
+                        "type": "string",
+                        "description": "CoinGecko token ID",
+                        "default": "ethereum"
+                    },
+                    "chain": {
+                        "type": "string",
+                        "enum": ["polygon-zkevm", "scroll", "zksync"],
+                        "default": "polygon-zkevm"
+                    },
+                    "compact": COMPACT_PROPERTY
                 }
             }
         )
@@ -227,33 +396,62 @@ async def list_tools() -> List[Tool]:
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Dict) -> List[TextContent]:
+    compact = arguments.get("compact", True)
+    
+    if name == "fetch_tvl":
+        protocol = arguments.get("protocol", "all")
+        result = await aggregator.fetch_tvl(protocol)
+        return text_content(result, compact)
+    
+    elif name == "get_protocol_data":
+        protocol_name = arguments.get("protocol_name")
+        if not protocol_name:
+            return text_content({"error": "protocol_name required"})
+        result = await aggregator.get_protocol_data(protocol_name)
+        return text_content(result, compact)
+    
+    elif name == "query_blockchain":
+        chain = arguments.get("chain", "polygon-zkevm")
+        method = arguments.get("method", "eth_blockNumber")
+        result = await aggregator.query_blockchain(chain, method)
+        return text_content(result, compact)
+    
+    elif name == "multicall":
+        calls = arguments.get("calls")
+        if not calls:
+            return text_content({"error": "calls required"})
+        result = await aggregator.multicall(arguments.get("chain", "polygon-zkevm"), calls)
+        return text_content(result, compact)
+    
+    elif name == "get_token_price":
+        token_id = arguments.get("token_id", "ethereum")
+        result = await aggregator.get_token_price(token_id)
+        return text_content(result, compact)
+    
+    elif name == "get_dashboard":
+        result = await aggregator.get_dashboard(
+            protocol=arguments.get("protocol", "all"),
+            token_id=arguments.get("token_id", "ethereum"),
+            chain=arguments.get("chain", "polygon-zkevm")
+        )
+        return text_content(result, compact)
+    
+    else:
+        return text_content({"error": f"Unknown tool: {name}"})
+
+async def main():
+    # Open the shared HTTP session once, close it on shutdown
     async with aggregator:
-        if name == "fetch_tvl":
-            protocol = arguments.get("protocol", "all")
-            result = await aggregator.fetch_tvl(protocol)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "get_protocol_data":
-            protocol_name = arguments.get("protocol_name")
-            if not protocol_name:
-                return [TextContent(type="text", text=json.dumps({"error": "protocol_name required"}))]
-            result = await aggregator.get_protocol_data(protocol_name)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "query_blockchain":
-            chain = arguments.get("chain", "polygon-zkevm")
-            method = arguments.get("method", "eth_blockNumber")
-            result = await aggregator.query_blockchain(chain, method)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        elif name == "get_token_price":
-            token_id = arguments.get("token_id", "ethereum")
-            result = await aggregator.get_token_price(token_id)
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
-        
-        else:
-            return [TextContent(type="text", text=json.dumps({"error": f"Unknown tool: {name}"}))]
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(read_stream, write_stream, app.create_initialization_options())
 
 if __name__ == "__main__":
+    # Use libuv's event loop when available (optional speedup)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     # Run MCP server with stdio transport
-    asyncio.run(stdio_server(app))
+    asyncio.run(main())